@@ -1,31 +1,161 @@
 import os
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+import orjson
+
+# The Google client libraries take hundreds of ms to import, so they are
+# loaded on first use rather than here. That keeps server startup (and the
+# first /health check on Render) fast.
 
 SCOPES = ['https://www.googleapis.com/auth/calendar.events']
 
+# Refresh the access token this long before Google says it expires
+EXPIRY_MARGIN = timedelta(minutes=5)
+
+# Cached (key, credentials, service), shared across tool calls. Kept as one
+# tuple so lock-free readers always see a consistent entry, even while
+# another thread replaces or resets it.
+_cache_lock = threading.Lock()
+_cache = None
+
+# Shared transport for token refreshes, so they reuse one keep-alive
+# connection to oauth2.googleapis.com. Built on first refresh.
+_auth_request = None
+
+# httplib2.Http is not thread-safe; each worker thread gets its own connection
+_thread_local = threading.local()
+
+
+def _cache_key(client_id, refresh_token):
+    """Hash the OAuth identity so the raw refresh token is not kept around as a key."""
+    return hashlib.sha256(f"{client_id}:{refresh_token}".encode()).hexdigest()
+
+
+def _is_fresh(creds):
+    """True if the cached access token is valid for at least EXPIRY_MARGIN."""
+    if creds is None or not creds.valid:
+        return False
+    if creds.expiry is None:
+        return True
+    # google-auth stores expiry as a naive UTC datetime
+    return creds.expiry - datetime.now(timezone.utc).replace(tzinfo=None) > EXPIRY_MARGIN
+
+
+def _build_request(http, *args, **kwargs):
+    """Issue each API request over the calling thread's own authorized connection."""
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.http import HttpRequest, build_http
+
+    thread_http = getattr(_thread_local, "http", None)
+    if thread_http is None:
+        # build_http() sets the client's default socket timeout, so a stuck
+        # connection can't hold a worker thread forever
+        thread_http = _thread_local.http = build_http()
+    return HttpRequest(AuthorizedHttp(http.credentials, http=thread_http), *args, **kwargs)
+
+
+def _orjson_model():
+    """
+    googleapiclient JsonModel that parses response bodies with orjson.
+    Requests keep the stock ASCII-escaped json.dumps serializer: httplib2
+    sends str bodies as Latin-1, so raw non-ASCII text would be corrupted.
+    """
+    from googleapiclient.model import JsonModel
+
+    class OrjsonModel(JsonModel):
+        def deserialize(self, content):
+            try:
+                body = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # Non-JSON bodies: let the stock model handle them
+                return super().deserialize(content)
+            if self._data_wrapper and isinstance(body, dict) and "data" in body:
+                body = body["data"]
+            return body
+
+    return OrjsonModel()
+
+
 def get_calendar_service():
     """
     Get authenticated Google Calendar service.
     Uses environment variables for production (Render).
+    The service is cached and only rebuilt when the access token is close to expiring.
+    Safe to call from multiple worker threads.
     """
-    
-    # Create credentials from environment variables
-    creds = Credentials(
-        token=None,  # Will be refreshed automatically
-        refresh_token=os.getenv("GOOGLE_REFRESH_TOKEN"),
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=os.getenv("GOOGLE_CLIENT_ID"),
-        client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
-        scopes=SCOPES
-    )
-    
-    # Refresh the access token
+    global _cache, _auth_request
+
+    client_id = os.getenv("GOOGLE_CLIENT_ID")
+    refresh_token = os.getenv("GOOGLE_REFRESH_TOKEN")
+    key = _cache_key(client_id, refresh_token)
+
+    # Fast path: reuse the already-valid token without touching the lock
+    cached = _cache
+    if cached is not None and cached[0] == key and _is_fresh(cached[1]):
+        return cached[2]
+
+    with _cache_lock:
+        # Another thread may have refreshed while we waited
+        cached = _cache
+        if cached is not None and cached[0] == key and _is_fresh(cached[1]):
+            return cached[2]
+
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from googleapiclient.discovery import build
+
+        if _auth_request is None:
+            import requests
+            session = requests.Session()
+            session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4))
+            _auth_request = Request(session=session)
+
+        # Create credentials from environment variables
+        creds = Credentials(
+            token=None,  # Will be refreshed below
+            refresh_token=refresh_token,
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id=client_id,
+            client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
+            scopes=SCOPES
+        )
+
+        # Refresh the access token
+        try:
+            creds.refresh(_auth_request)
+        except Exception as e:
+            raise Exception(f"Failed to refresh Google credentials: {e}")
+
+        # Build and cache the calendar service
+        service = build(
+            'calendar', 'v3',
+            credentials=creds,
+            requestBuilder=_build_request,
+            model=_orjson_model()
+        )
+        _cache = (key, creds, service)
+        return service
+
+
+def reset_calendar_service():
+    """Drop the cached credentials and service so the next call rebuilds them."""
+    global _cache
+
+    with _cache_lock:
+        _cache = None
+
+
+def call_calendar(fn):
+    """
+    Run fn(service) against the cached Calendar service.
+    If the cached credentials can no longer be refreshed, rebuild them
+    from the environment and retry once.
+    """
+    from google.auth.exceptions import RefreshError
+
     try:
-        creds.refresh(Request())
-    except Exception as e:
-        raise Exception(f"Failed to refresh Google credentials: {e}")
-    
-    # Build and return the calendar service
-    return build('calendar', 'v3', credentials=creds)
\ No newline at end of file
+        return fn(get_calendar_service())
+    except RefreshError:
+        reset_calendar_service()
+        return fn(get_calendar_service())
@@ -1,29 +1,137 @@
 from fastmcp import FastMCP
 import os
+import sys
+import asyncio
 import httpx
-from datetime import datetime, timedelta
-from calendar_auth import get_calendar_service
+import orjson
+from datetime import date as date_type, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from calendar_auth import get_calendar_service, call_calendar
 import json
+from collections import defaultdict
+import uuid
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, time_ns
+from cachetools import TTLCache
+from pydantic import BaseModel
 
 # --- ADD STARLETTE IMPORTS FOR HEALTH CHECK ---
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+# API Keys from environment
+PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
+
+# Fail fast on connect problems, but give long completions time to finish
+PERPLEXITY_READ_TIMEOUT = float(os.getenv("PERPLEXITY_READ_TIMEOUT", "120"))
+
+# Hard upper bounds on a whole tool call, on top of the per-request timeouts
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "300"))
+CALENDAR_TIMEOUT = float(os.getenv("CALENDAR_TIMEOUT", "30"))
+
+# Built once and sent as the client's default headers on every search
+PERPLEXITY_HEADERS = {
+    "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
+    "Content-Type": "application/json"
+}
+
+# Shared Perplexity client so searches reuse pooled keep-alive connections
+# instead of paying a TCP + TLS handshake on every call
+_perplexity_client = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(connect=5.0, read=PERPLEXITY_READ_TIMEOUT, write=10.0, pool=5.0),
+    limits=httpx.Limits(max_keepalive_connections=10),
+    headers=PERPLEXITY_HEADERS
+)
+
+async def _warm_up() -> None:
+    """Open the Perplexity connection and fetch a Google access token before the first tool call."""
+    names, tasks = [], []
+    if PERPLEXITY_API_KEY:
+        names.append("Perplexity connection")
+        tasks.append(_perplexity_client.get("https://api.perplexity.ai/"))
+    if os.getenv("GOOGLE_REFRESH_TOKEN"):
+        names.append("Google Calendar auth")
+        tasks.append(_run_calendar(get_calendar_service))
+    
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            print(f"❌ Warm-up: {name} failed: {result}")
+        else:
+            print(f"✅ Warm-up: {name} ready")
+
 # Initialize FastMCP server
 mcp = FastMCP("IP Assistant MCP Server")
 
-# API Keys from environment
-PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
+async def _with_timeout(coro, seconds: float, timeout_message: str) -> str:
+    """Await coro, returning timeout_message if it takes longer than `seconds`."""
+    try:
+        async with asyncio.timeout(seconds):
+            return await coro
+    except TimeoutError:
+        return timeout_message
+
+# --- BACKGROUND JOBS ---
+# Slow tools return a job ID right away and run in the background, so MCP
+# clients aren't left waiting on a single long request. Results are
+# fetched with poll_job and dropped JOB_TTL_SECONDS after they finish.
+# Jobs that produce output incrementally append it to _job_partial so
+# poll_job can show progress before the job is done.
+
+JOB_TTL_SECONDS = 600
+
+_jobs: dict[str, asyncio.Task] = {}
+_job_finished_at: dict[str, float] = {}
+_job_partial: dict[str, list[str]] = {}
+
+def _reap_jobs() -> None:
+    """Forget jobs that finished more than JOB_TTL_SECONDS ago."""
+    cutoff = monotonic() - JOB_TTL_SECONDS
+    for job_id, finished_at in list(_job_finished_at.items()):
+        if finished_at < cutoff:
+            del _job_finished_at[job_id]
+            _jobs.pop(job_id, None)
+
+def _finish_job(job_id: str) -> None:
+    _job_finished_at[job_id] = monotonic()
+    _job_partial.pop(job_id, None)
+
+def _start_job(coro, job_id: str | None = None) -> str:
+    """Run coro in the background and return its job ticket as JSON."""
+    _reap_jobs()
+    job_id = job_id or str(uuid.uuid4())
+    task = asyncio.create_task(coro)
+    task.add_done_callback(lambda _: _finish_job(job_id))
+    _jobs[job_id] = task
+    return json.dumps({"job_id": job_id, "status": "pending"})
 
 @mcp.tool()
-async def search_patents(query: str, focus: str = "patents") -> str:
+async def poll_job(job_id: str) -> str:
     """
-    Search for patents and prior art using Perplexity AI.
-    (This tool is async, which is good)
+    Check on a job started by search_patents, schedule_meeting,
+    schedule_meetings_batch or plan_meeting.
+    Returns the result once the job is done, or any partial output so far.
     """
-    
-    if focus == "patents":
-        prompt = f"""Search for patents and prior art related to: {query}
+    task = _jobs.get(job_id)
+    if task is None:
+        return json.dumps({"status": "unknown", "error": f"No job with ID {job_id}"})
+    if not task.done():
+        partial = "".join(_job_partial.get(job_id, ()))
+        if partial:
+            return json.dumps({"status": "pending", "partial": partial}, ensure_ascii=False)
+        return json.dumps({"status": "pending"})
+    if task.cancelled():
+        return json.dumps({"status": "error", "error": "Job was cancelled"})
+    if task.exception() is not None:
+        return json.dumps({"status": "error", "error": str(task.exception())}, ensure_ascii=False)
+    return json.dumps({"status": "done", "result": task.result()}, ensure_ascii=False)
+
+# --- PERPLEXITY SEARCH ---
+
+PATENT_PROMPT = """Search for patents and prior art related to: {query}
 
 Please provide:
 1. Specific US patent numbers (format: US 1,234,567)
@@ -33,46 +141,230 @@ Please provide:
 5. Key differences from the query
 
 Focus on the most relevant 3-5 patents."""
+
+TECHNICAL_PROMPT = "Search for technical information about: {query}"
+
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a patent research assistant."}
+
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+
+# Request fields that are the same for every search. Responses are
+# streamed (SSE) so the answer can be shown while it is being generated.
+PERPLEXITY_PAYLOAD = {"model": "sonar", "temperature": 0.2, "max_tokens": 1500, "stream": True}
+
+# Prior-art questions repeat a lot within a session, so successful
+# Perplexity answers are kept for an hour. Queries asking for fresh
+# results always go to Perplexity.
+_patent_cache = TTLCache(maxsize=512, ttl=3600)
+
+_FRESHNESS_RE = re.compile(r"\b(latest|newest|recent(ly)?|today|this (week|month|year))\b", re.IGNORECASE)
+
+def _search_cache_key(query: str, focus: str) -> str | None:
+    """Cache key for a search, or None if the query shouldn't be cached."""
+    if _FRESHNESS_RE.search(query):
+        return None
+    # Case and spacing don't change the answer, so don't let them miss the cache
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha256(f"{focus}|{normalized}".encode()).hexdigest()
+
+@mcp.tool()
+async def search_patents(query: str, focus: str = "patents") -> str:
+    """
+    Search for patents and prior art using Perplexity AI.
+    Returns a job ID; call poll_job with it to get the results.
+    Repeated searches are answered straight from cache unless the query
+    asks for the latest/recent results.
+    """
+    if not PERPLEXITY_API_KEY:
+        return "Error: PERPLEXITY_API_KEY is not set on the server."
+    
+    cache_key = _search_cache_key(query, focus)
+    cached = _patent_cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return json.dumps({"status": "done", "result": cached}, ensure_ascii=False)
+    job_id = str(uuid.uuid4())
+    return _start_job(_with_timeout(
+        _do_search(query, focus, job_id),
+        SEARCH_TIMEOUT,
+        "Error: Search request timed out. Please try again."
+    ), job_id)
+
+async def _do_search(query: str, focus: str, job_id: str | None = None) -> str:
+    """
+    Run the Perplexity search behind search_patents.
+    Streamed text is published to _job_partial[job_id] as it arrives.
+    """
+    if focus == "patents":
+        prompt = PATENT_PROMPT.format(query=query)
     else:
-        prompt = f"Search for technical information about: {query}"
+        prompt = TECHNICAL_PROMPT.format(query=query)
         
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                "https://api.perplexity.ai/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "sonar",
-                    "messages": [
-                        {"role": "system", "content": "You are a patent research assistant."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 1500
-                },
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            else:
+    chunks = _job_partial.setdefault(job_id, []) if job_id else []
+    finished = False
+    try:
+        async with _perplexity_client.stream(
+            "POST",
+            PERPLEXITY_URL,
+            # Content-Type is set on the client; orjson emits the body bytes directly
+            content=orjson.dumps({
+                **PERPLEXITY_PAYLOAD,
+                "messages": [SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+            })
+        ) as response:
+            if response.status_code != 200:
                 return f"Error: Perplexity API returned status {response.status_code}"
             
-        except httpx.TimeoutException:
-            return "Error: Search request timed out. Please try again."
-        except Exception as e:
-            return f"Error searching patents: {str(e)}"
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choice = orjson.loads(data)["choices"][0]
+                delta = choice.get("delta", {}).get("content")
+                if delta:
+                    chunks.append(delta)
+                if choice.get("finish_reason"):
+                    finished = True
+        
+        content = "".join(chunks)
+        # Only cache complete answers; a cut-off stream would otherwise
+        # pin a truncated result for the whole TTL
+        cache_key = _search_cache_key(query, focus)
+        if cache_key and finished and content:
+            _patent_cache[cache_key] = content
+        return content
+        
+    except httpx.TimeoutException:
+        return "Error: Search request timed out. Please try again."
+    except Exception as e:
+        return f"Error searching patents: {str(e)}"
 
-# --- CALENDAR TOOLS (Synchronous / Blocking) ---
-# As requested, these will run synchronously and block the server.
-# This may cause Render health checks to time out if a call is slow.
+# --- CALENDAR TOOLS ---
+# The Google API client is blocking, so each tool runs its _sync_* helper
+# in a worker thread. This keeps the event loop (and /health) responsive
+# while a Calendar call is in flight. Calendar work gets its own pool so it
+# doesn't queue behind other users of the default executor, and so it can
+# be sized to the Google API quota.
 
-@mcp.tool()
-def schedule_meeting(
+CALENDAR_WORKERS = int(os.getenv("CALENDAR_WORKERS", "8"))
+_calendar_executor = ThreadPoolExecutor(max_workers=CALENDAR_WORKERS, thread_name_prefix="gcal")
+
+async def _run_calendar(fn, *args):
+    """Run a blocking Calendar helper on the dedicated calendar thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_calendar_executor, fn, *args)
+
+# Parser for Google Calendar event timestamps. ciso8601's C parser is
+# several times faster than fromisoformat in the per-event loops; without
+# it, fall back to fromisoformat, which handles the trailing 'Z' on
+# Python 3.11+ (already required for asyncio.timeout).
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
+def _parse_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD tool argument as midnight that day; raises ValueError otherwise."""
+    return datetime.combine(date_type.fromisoformat(value), datetime.min.time())
+
+# Hand-rolled equivalents of strftime('%I:%M %p'), ('%A, %B %d') and
+# ('%A, %B %d, %Y'): cheaper in the per-event loops and independent of
+# the container's locale.
+_DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+           'August', 'September', 'October', 'November', 'December')
+
+def _fmt_time(dt: datetime) -> str:
+    return f"{(dt.hour - 1) % 12 + 1:02d}:{dt.minute:02d} {'AM' if dt.hour < 12 else 'PM'}"
+
+def _fmt_day(dt: datetime) -> str:
+    return f"{_DAYS[dt.weekday()]}, {_MONTHS[dt.month - 1]} {dt.day:02d}"
+
+def _fmt_full_date(dt: datetime) -> str:
+    return f"{_fmt_day(dt)}, {dt.year}"
+
+# Parts of every event body that never change. They are shared, not
+# copied, so they must not be mutated.
+MEETING_TIMEZONE = 'America/New_York'
+DEFAULT_DESCRIPTION = 'IP Intake Meeting'
+_REMINDERS = {
+    'useDefault': False,
+    'overrides': [
+        {'method': 'email', 'minutes': 24 * 60},
+        {'method': 'popup', 'minutes': 30},
+    ],
+}
+_CONFERENCE_KEY = {'type': 'hangoutsMeet'}
+
+def _build_event_body(
+    title: str,
+    attendee_email: str,
+    date: str,
+    time: str,
+    duration_minutes: int = 60,
+    description: str = ""
+) -> dict:
+    """Build a Calendar event body. Raises ValueError on a bad date/time."""
+    start_dt = datetime.fromisoformat(f"{date}T{time}")
+    end_dt = start_dt + timedelta(minutes=duration_minutes)
+    
+    return {
+        'summary': title,
+        'description': description or DEFAULT_DESCRIPTION,
+        'start': {'dateTime': start_dt.isoformat(), 'timeZone': MEETING_TIMEZONE},
+        'end': {'dateTime': end_dt.isoformat(), 'timeZone': MEETING_TIMEZONE},
+        'attendees': [{'email': attendee_email}],
+        'reminders': _REMINDERS,
+        'conferenceData': {
+            'createRequest': {
+                'requestId': f"ip-assistant-{time_ns()}",
+                'conferenceSolutionKey': _CONFERENCE_KEY
+            }
+        }
+    }
+
+def _format_scheduled(title: str, event_result: dict) -> str:
+    """Confirmation message for a newly created event."""
+    meet_link = event_result.get('hangoutLink', 'No video link')
+    calendar_link = event_result.get('htmlLink', 'No calendar link')
+    
+    return f"✅ Meeting scheduled successfully!\n📅 {title}\n🔗 Calendar: {calendar_link}\n📹 Google Meet: {meet_link}"
+
+# Partial-response masks: ask Google for only the fields we read back,
+# which shrinks the responses several-fold
+EVENT_LIST_FIELDS = 'items(id,summary,start(dateTime,date),end(dateTime,date))'
+EVENT_INSERT_FIELDS = 'id,htmlLink,hangoutLink'
+
+def _insert_request(service, event: dict):
+    """Build (but don't send) the insert request for a prepared event body."""
+    return service.events().insert(
+        calendarId='primary',
+        body=event,
+        conferenceDataVersion=1,
+        sendUpdates='all',
+        fields=EVENT_INSERT_FIELDS
+    )
+
+def _sync_insert_event(event: dict) -> dict:
+    """Blocking insert of a prepared event body."""
+    return call_calendar(lambda service: _insert_request(service, event).execute())
+
+def _sync_find_overlapping(event: dict) -> list[dict]:
+    """Blocking lookup of existing events that overlap a prepared event body."""
+    tz = ZoneInfo(event['start']['timeZone'])
+    time_min = datetime.fromisoformat(event['start']['dateTime']).replace(tzinfo=tz)
+    time_max = datetime.fromisoformat(event['end']['dateTime']).replace(tzinfo=tz)
+    
+    events_result = call_calendar(lambda service: service.events().list(
+        calendarId='primary',
+        timeMin=time_min.isoformat(),
+        timeMax=time_max.isoformat(),
+        singleEvents=True,
+        fields=EVENT_LIST_FIELDS
+    ).execute())
+    return events_result.get('items', [])
+
+async def _schedule_meeting(
     title: str,
     attendee_email: str,
     date: str,
@@ -80,145 +372,242 @@ def schedule_meeting(
     duration_minutes: int = 60,
     description: str = ""
 ) -> str:
+    """Create the meeting and warn about anything already booked in that slot."""
+    try:
+        event = _build_event_body(title, attendee_email, date, time, duration_minutes, description)
+    except ValueError:
+        return f"❌ Invalid date/time format. Use YYYY-MM-DD for date and HH:MM for time. Got: {date} {time}"
+    
+    # The overlap check doesn't depend on the insert, so both round trips run at once
+    event_result, overlapping = await asyncio.gather(
+        _run_calendar(_sync_insert_event, event),
+        _run_calendar(_sync_find_overlapping, event),
+        return_exceptions=True
+    )
+    if isinstance(event_result, Exception):
+        return f"❌ Error creating meeting: {str(event_result)}"
+    
+    message = _format_scheduled(title, event_result)
+    if not isinstance(overlapping, Exception):
+        # The lookup may already see the event we just created
+        conflicts = [e.get('summary', 'Busy') for e in overlapping if e.get('id') != event_result.get('id')]
+        if conflicts:
+            message += f"\n⚠️ Overlaps with: {', '.join(conflicts)}"
+    return message
+
+# Google Calendar accepts at most 50 calls in one batch request
+BATCH_LIMIT = 50
+
+class MeetingSpec(BaseModel):
+    """One meeting for schedule_meetings_batch."""
+    title: str
+    attendee_email: str
+    date: str
+    time: str
+    duration_minutes: int = 60
+    description: str = ""
+
+def _sync_batch_calendar(build_requests) -> dict:
     """
-    Schedule a meeting on Google Calendar.
-    (This is a BLOCKING call)
+    Send several Calendar API calls in as few HTTP round trips as possible.
+    build_requests(service) returns {key: request}; the result maps each
+    key to its response, or to the exception that call raised.
+    If a whole chunk fails to send, that exception is recorded against
+    each of its calls that had no result yet, so results from earlier
+    chunks are still reported.
     """
+    service = get_calendar_service()
+    requests = list(build_requests(service).items())
+    outcomes = {}
+    
+    def collect(request_id, response, exception):
+        outcomes[request_id] = exception if exception is not None else response
+    
+    for offset in range(0, len(requests), BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=collect)
+        chunk = requests[offset:offset + BATCH_LIMIT]
+        for key, request in chunk:
+            batch.add(request, request_id=key)
+        try:
+            batch.execute()
+        except Exception as e:
+            for key, _ in chunk:
+                outcomes.setdefault(key, e)
+    
+    return outcomes
+
+def _sync_schedule_meetings_batch(meetings: list[MeetingSpec]) -> str:
+    """Blocking implementation of schedule_meetings_batch."""
+    if not meetings:
+        return "❌ No meetings to schedule."
+    
     try:
-        service = get_calendar_service() # Blocking call
+        results = [None] * len(meetings)
+        events = {}
+        for i, m in enumerate(meetings):
+            try:
+                event = _build_event_body(m.title, m.attendee_email, m.date, m.time, m.duration_minutes, m.description)
+            except ValueError:
+                results[i] = f"❌ {m.title}: Invalid date/time format. Use YYYY-MM-DD for date and HH:MM for time. Got: {m.date} {m.time}"
+                continue
+            # Conference request IDs must be unique per event
+            event['conferenceData']['createRequest']['requestId'] += f"-{i}"
+            events[str(i)] = event
+        
+        outcomes = _sync_batch_calendar(lambda service: {
+            key: _insert_request(service, event)
+            for key, event in events.items()
+        })
+        
+        for key, outcome in outcomes.items():
+            title = meetings[int(key)].title
+            if isinstance(outcome, Exception):
+                results[int(key)] = f"❌ {title}: Error creating meeting: {outcome}"
+            else:
+                results[int(key)] = _format_scheduled(title, outcome)
+        
+        return "\n\n".join(results)
         
+    except Exception as e:
+        return f"❌ Error creating meetings: {str(e)}"
+
+def _sync_plan_meeting(
+    title: str,
+    attendee_email: str,
+    date: str,
+    time: str,
+    duration_minutes: int = 60,
+    description: str = ""
+) -> str:
+    """Blocking implementation of plan_meeting."""
+    try:
         try:
-            start_dt = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+            event = _build_event_body(title, attendee_email, date, time, duration_minutes, description)
+            target_date = _parse_date(date)
         except ValueError:
             return f"❌ Invalid date/time format. Use YYYY-MM-DD for date and HH:MM for time. Got: {date} {time}"
         
-        end_dt = start_dt + timedelta(minutes=duration_minutes)
+        # Same zone the event is created in, so the window matches its slot
+        time_min, time_max = _business_hours(target_date, ZoneInfo(MEETING_TIMEZONE))
+        outcomes = _sync_batch_calendar(lambda service: {
+            'insert': _insert_request(service, event),
+            'day': service.events().list(
+                calendarId='primary',
+                timeMin=time_min,
+                timeMax=time_max,
+                singleEvents=True,
+                orderBy='startTime',
+                fields=EVENT_LIST_FIELDS
+            ),
+        })
         
-        event = {
-            'summary': title,
-            'description': description or 'IP Intake Meeting',
-            'start': {'dateTime': start_dt.isoformat(), 'timeZone': 'America/New_York'},
-            'end': {'dateTime': end_dt.isoformat(), 'timeZone': 'America/New_York'},
-            'attendees': [{'email': attendee_email}],
-            'reminders': {
-                'useDefault': False,
-                'overrides': [
-                    {'method': 'email', 'minutes': 24 * 60},
-                    {'method': 'popup', 'minutes': 30},
-                ],
-            },
-            'conferenceData': {
-                'createRequest': {
-                    'requestId': f"ip-assistant-{int(datetime.now().timestamp())}",
-                    'conferenceSolutionKey': {'type': 'hangoutsMeet'}
-                }
-            }
-        }
-        
-        event_result = service.events().insert(
-            calendarId='primary',
-            body=event,
-            conferenceDataVersion=1,
-            sendUpdates='all'
-        ).execute() # Blocking call
+        event_result = outcomes['insert']
+        if isinstance(event_result, Exception):
+            return f"❌ Error creating meeting: {str(event_result)}"
         
-        meet_link = event_result.get('hangoutLink', 'No video link')
-        calendar_link = event_result.get('htmlLink', 'No calendar link')
-        
-        return f"✅ Meeting scheduled successfully!\n📅 {title}\n🔗 Calendar: {calendar_link}\n📹 Google Meet: {meet_link}"
+        parts = [_format_scheduled(title, event_result)]
+        day = outcomes['day']
+        if not isinstance(day, Exception):
+            # Batched calls run in no fixed order, so the new event may or may not be listed
+            others = [e for e in day.get('items', []) if e.get('id') != event_result.get('id')]
+            if others:
+                parts.append(_format_day_schedule(target_date, others))
+            else:
+                parts.append(f"Nothing else scheduled on {_fmt_full_date(target_date)}.")
+        return "\n\n".join(parts)
         
     except Exception as e:
         return f"❌ Error creating meeting: {str(e)}"
 
-@mcp.tool()
-def find_available_times(
+def _sync_find_available_times(
     date: str,
     duration_minutes: int = 60
 ) -> str:
-    """
-    Find available time slots on a specific date.
-    (This is a BLOCKING call)
-    """
+    """Blocking implementation of find_available_times."""
     try:
-        service = get_calendar_service() # Blocking
-        
         try:
-            target_date = datetime.strptime(date, "%Y-%m-%d")
+            target_date = _parse_date(date)
         except ValueError:
             return f"❌ Invalid date format. Use YYYY-MM-DD. Got: {date}"
         
-        start_of_day = target_date.replace(hour=9, minute=0, second=0)
-        end_of_day = target_date.replace(hour=17, minute=0, second=0)
-        
-        events_result = service.events().list(
+        time_min, time_max = _business_hours(target_date)
+        events_result = call_calendar(lambda service: service.events().list(
             calendarId='primary',
-            timeMin=start_of_day.isoformat() + 'Z',
-            timeMax=end_of_day.isoformat() + 'Z',
+            timeMin=time_min,
+            timeMax=time_max,
             singleEvents=True,
-            orderBy='startTime'
-        ).execute() # Blocking
-        
-        events = events_result.get('items', [])
-        
-        if not events:
-            return f"✅ Fully available on {target_date.strftime('%A, %B %d, %Y')}"
-        
-        busy_slots = []
-        for event in events:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            end = event['end'].get('dateTime', event['end'].get('date'))
-            summary = event.get('summary', 'Busy')
-            
-            if 'T' in start:
-                start_time = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                end_time = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                busy_slots.append(f"• {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}: {summary}")
-            else:
-                busy_slots.append(f"• All day: {summary}")
+            orderBy='startTime',
+            fields=EVENT_LIST_FIELDS
+        ).execute())
         
-        return f"📅 Schedule for {target_date.strftime('%A, %B %d, %Y')}:\n\nBusy times:\n{chr(10).join(busy_slots)}"
+        return _format_day_schedule(target_date, events_result.get('items', []), duration_minutes)
         
     except Exception as e:
         return f"❌ Error checking availability: {str(e)}"
 
-@mcp.tool()
-def list_upcoming_meetings(days_ahead: int = 7) -> str:
-    """
-    List upcoming meetings in the next N days.
-    (This is a BLOCKING call)
-    """
-    try:
-        service = get_calendar_service() # Blocking
+def _business_hours(target_date: datetime, tz=timezone.utc) -> tuple[str, str]:
+    """timeMin/timeMax of the 9:00-17:00 window (in tz) checked on a given day."""
+    start_of_day = target_date.replace(hour=9, minute=0, second=0, tzinfo=tz)
+    end_of_day = target_date.replace(hour=17, minute=0, second=0, tzinfo=tz)
+    return start_of_day.isoformat(), end_of_day.isoformat()
+
+def _format_day_schedule(target_date: datetime, events: list[dict], duration_minutes: int | None = None) -> str:
+    """Describe the busy times on one day, with a scheduling tip if duration_minutes is given."""
+    if not events:
+        return f"✅ Fully available on {_fmt_full_date(target_date)}"
+    
+    parts = [f"📅 Schedule for {_fmt_full_date(target_date)}:", "", "Busy times:"]
+    for event in events:
+        # Timed events carry dateTime; all-day events only have date
+        start_info = event['start']
+        start = start_info.get('dateTime') or start_info.get('date')
+        summary = event.get('summary', 'Busy')
         
-        now = datetime.utcnow()
+        if 'T' in start:
+            end_info = event['end']
+            end = end_info.get('dateTime') or end_info.get('date')
+            start_time = _parse_iso(start)
+            end_time = _parse_iso(end)
+            parts.append(f"• {_fmt_time(start_time)} - {_fmt_time(end_time)}: {summary}")
+        else:
+            parts.append(f"• All day: {summary}")
+    
+    if duration_minutes:
+        parts += ["", f"💡 Look for {duration_minutes}-minute gaps between meetings for scheduling."]
+    return "\n".join(parts)
+
+def _sync_list_upcoming_meetings(days_ahead: int = 7) -> str:
+    """Blocking implementation of list_upcoming_meetings."""
+    try:
+        now = datetime.now(timezone.utc)
         end_date = now + timedelta(days=days_ahead)
         
-        events_result = service.events().list(
+        events_result = call_calendar(lambda service: service.events().list(
             calendarId='primary',
-            timeMin=now.isoformat() + 'Z',
-            timeMax=end_of_day.isoformat() + 'Z',
+            timeMin=now.isoformat(),
+            timeMax=end_date.isoformat(),
             maxResults=20,
             singleEvents=True,
-            orderBy='startTime'
-        ).execute() # Blocking
+            orderBy='startTime',
+            fields=EVENT_LIST_FIELDS
+        ).execute())
         
         events = events_result.get('items', [])
         
         if not events:
             return f"📭 No upcoming meetings in the next {days_ahead} days."
         
-        meetings_by_date = {}
+        meetings_by_date = defaultdict(list)
         for event in events:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            summary = event.get('summary', 'No title')
+            # All-day events (date only) aren't listed, so skip straight past them
+            start_info = event['start']
+            start = start_info.get('dateTime') or start_info.get('date')
             
             if 'T' in start:
-                dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                date_key = dt.strftime('%A, %B %d')
-                time_str = dt.strftime('%I:%M %p')
-                
-                if date_key not in meetings_by_date:
-                    meetings_by_date[date_key] = []
+                summary = event.get('summary', 'No title')
+                dt = _parse_iso(start)
+                date_key = _fmt_day(dt)
+                time_str = _fmt_time(dt)
                 meetings_by_date[date_key].append(f"  • {time_str}: {summary}")
         
         output = [f"📅 Upcoming meetings (next {days_ahead} days):\n"]
@@ -232,6 +621,132 @@ def list_upcoming_meetings(days_ahead: int = 7) -> str:
     except Exception as e:
         return f"❌ Error listing meetings: {str(e)}"
 
+# The insert may still land after we stop waiting, so don't invite a blind retry
+SCHEDULE_TIMEOUT_MESSAGE = (
+    "❌ Scheduling timed out. The meeting may still have been created; "
+    "check list_upcoming_meetings before trying again."
+)
+
+@mcp.tool()
+async def schedule_meeting(
+    title: str,
+    attendee_email: str,
+    date: str,
+    time: str,
+    duration_minutes: int = 60,
+    description: str = ""
+) -> str:
+    """
+    Schedule a meeting on Google Calendar.
+    Returns a job ID; call poll_job with it to get the confirmation,
+    which also flags any existing events in the same slot.
+    """
+    return _start_job(_with_timeout(
+        _schedule_meeting(title, attendee_email, date, time, duration_minutes, description),
+        CALENDAR_TIMEOUT,
+        SCHEDULE_TIMEOUT_MESSAGE
+    ))
+
+@mcp.tool()
+async def schedule_meetings_batch(meetings: list[MeetingSpec]) -> str:
+    """
+    Schedule up to 50 meetings on Google Calendar in one batched request.
+    Returns a job ID; call poll_job with it to get the confirmations.
+    """
+    # One batch request, so the whole call fits in CALENDAR_TIMEOUT and a
+    # timeout can't hide which meetings an earlier chunk already created
+    if len(meetings) > BATCH_LIMIT:
+        return f"❌ Too many meetings. Schedule at most {BATCH_LIMIT} at a time."
+    return _start_job(_with_timeout(
+        _run_calendar(_sync_schedule_meetings_batch, meetings),
+        CALENDAR_TIMEOUT,
+        SCHEDULE_TIMEOUT_MESSAGE
+    ))
+
+@mcp.tool()
+async def plan_meeting(
+    title: str,
+    attendee_email: str,
+    date: str,
+    time: str,
+    duration_minutes: int = 60,
+    description: str = ""
+) -> str:
+    """
+    Schedule a meeting and get the rest of that day's schedule, in one batched request.
+    Returns a job ID; call poll_job with it to get the result.
+    """
+    return _start_job(_with_timeout(
+        _run_calendar(
+            _sync_plan_meeting, title, attendee_email, date, time, duration_minutes, description
+        ),
+        CALENDAR_TIMEOUT,
+        SCHEDULE_TIMEOUT_MESSAGE
+    ))
+
+@mcp.tool()
+async def find_available_times(
+    date: str,
+    duration_minutes: int = 60
+) -> str:
+    """
+    Find available time slots on a specific date.
+    """
+    return await _with_timeout(
+        _run_calendar(_sync_find_available_times, date, duration_minutes),
+        CALENDAR_TIMEOUT,
+        "❌ Checking availability timed out. Please try again."
+    )
+
+# Upper bound on days checked by one find_available_times_range call
+MAX_RANGE_DAYS = 14
+
+@mcp.tool()
+async def find_available_times_range(
+    start_date: str,
+    end_date: str,
+    duration_minutes: int = 60
+) -> str:
+    """
+    Find available time slots on every date from start_date to end_date (inclusive).
+    All days are checked concurrently.
+    """
+    try:
+        first = _parse_date(start_date)
+        last = _parse_date(end_date)
+    except ValueError:
+        return f"❌ Invalid date format. Use YYYY-MM-DD. Got: {start_date} to {end_date}"
+    
+    days = (last - first).days + 1
+    if days < 1:
+        return f"❌ end_date must not be before start_date. Got: {start_date} to {end_date}"
+    if days > MAX_RANGE_DAYS:
+        return f"❌ Date range too long. Check at most {MAX_RANGE_DAYS} days at a time."
+    
+    dates = [(first + timedelta(days=i)).date().isoformat() for i in range(days)]
+    return await _with_timeout(
+        _gather_days(dates, duration_minutes),
+        CALENDAR_TIMEOUT,
+        "❌ Checking availability timed out. Please try again."
+    )
+
+async def _gather_days(dates: list[str], duration_minutes: int) -> str:
+    results = await asyncio.gather(*[
+        _run_calendar(_sync_find_available_times, d, duration_minutes) for d in dates
+    ])
+    return "\n\n".join(results)
+
+@mcp.tool()
+async def list_upcoming_meetings(days_ahead: int = 7) -> str:
+    """
+    List upcoming meetings in the next N days.
+    """
+    return await _with_timeout(
+        _run_calendar(_sync_list_upcoming_meetings, days_ahead),
+        CALENDAR_TIMEOUT,
+        "❌ Listing meetings timed out. Please try again."
+    )
+
 # --- RENDER HEALTH CHECK ---
 # This is still mandatory for Render deployment,
 # regardless of using 'http' or 'sse' transport.
@@ -252,16 +767,28 @@ This server helps Daimler engineers move inventions through the IP pipeline.
 📋 Available Tools:
 
 1. search_patents
-   - Search for patents and prior art using Perplexity AI
+   - Search for patents and prior art using Perplexity AI (returns a job ID)
 
 2. schedule_meeting
-   - Create Google Calendar events
+   - Create Google Calendar events (returns a job ID)
+
+3. schedule_meetings_batch
+   - Create several events in one batched request (returns a job ID)
+
+4. plan_meeting
+   - Create an event and see that day's schedule in one request (returns a job ID)
 
-3. find_available_times
+5. find_available_times
    - Check calendar availability
 
-4. list_upcoming_meetings
+6. find_available_times_range
+   - Check availability across several days at once
+
+7. list_upcoming_meetings
    - View upcoming meetings
+
+8. poll_job
+   - Get the result of a search_patents or scheduling job
 """
 
 @mcp.resource("server://health")
@@ -280,6 +807,22 @@ Transport: HTTP
 """
 
 
+async def _serve(port: int) -> None:
+    """
+    Run the HTTP server, warming up connections on startup and closing the
+    shared clients on shutdown. This wraps the whole process rather than
+    using the FastMCP lifespan, which some fastmcp versions run once per
+    MCP session.
+    """
+    # Not awaited, so the server (and /health) come up without waiting on it
+    warm_up = asyncio.create_task(_warm_up())
+    try:
+        await mcp.run_async(transport="http", host="0.0.0.0", port=port)
+    finally:
+        warm_up.cancel()
+        await _perplexity_client.aclose()
+        _calendar_executor.shutdown(wait=False, cancel_futures=True)
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     
@@ -293,10 +836,29 @@ if __name__ == "__main__":
 ║  Tools available:                                    ║
 ║    • search_patents (Perplexity AI)                 ║
 ║    • schedule_meeting (Google Calendar)             ║
+║    • schedule_meetings_batch                        ║
+║    • plan_meeting                                   ║
 ║    • find_available_times                           ║
+║    • find_available_times_range                     ║
 ║    • list_upcoming_meetings                         ║
+║    • poll_job                                       ║
 ║  🩺 Health Check: /health                           ║
 ╚══════════════════════════════════════════════════════╝
     """)
     
-    mcp.run(transport="http", host="0.0.0.0", port=port)
\ No newline at end of file
+    if not PERPLEXITY_API_KEY:
+        print("⚠️  PERPLEXITY_API_KEY is not set; search_patents will return an error")
+    
+    # Faster event loop for the HTTP transport; falls back to asyncio's default.
+    # The loop runner is used instead of install(), which sets a global
+    # event loop policy and is deprecated on Python 3.12+.
+    try:
+        if sys.platform == "win32":
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        print("⚠️  uvloop/winloop not installed, using the default asyncio event loop")
+        asyncio.run(_serve(port))
+    else:
+        fast_loop.run(_serve(port))
\ No newline at end of file